@@ -1,14 +1,50 @@
 import boto3
 from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from decimal import Decimal
 import json
 import time
-from datetime import datetime
 
-# 初始化 DynamoDB 客户端
-dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+# 初始化 DynamoDB 客户端（更大的连接池 + TCP keep-alive + 自适应重试）
+dynamodb_config = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    connect_timeout=1,
+    read_timeout=3
+)
+dynamodb = boto3.resource('dynamodb', region_name='us-east-1', config=dynamodb_config)
+# 热点读路径使用低层 client（resource.meta.client 会被注入高层序列化，所以单独创建）
+client = boto3.client('dynamodb', region_name='us-east-1', config=dynamodb_config)
+deserializer = TypeDeserializer()
+serializer = TypeSerializer()
 cards_table = dynamodb.Table('cards')
 user_cards_table = dynamodb.Table('user-cards')
+# user-cards 的 GSI (card_id, user_id)，用于卡片更新/删除时找到所有持卡记录（只需要主键）
+CARD_USERS_INDEX = 'card_id-user_id-index'
+# 反范式化的类别表：主键 category + card_id，GSI category-rate-index (category, rate)
+card_categories_table = dynamodb.Table('card-categories')
+CATEGORY_RATE_INDEX = 'category-rate-index'
+
+# BatchGetItem 单次请求最多 100 个 key
+BATCH_GET_LIMIT = 100
+BATCH_RETRY_BASE_DELAY = 0.05
+BATCH_RETRY_MAX_DELAY = 1.0
+BATCH_RETRY_MAX_ATTEMPTS = 8
+
+# TransactWriteItems 单个事务最多 100 个操作
+TRANSACT_WRITE_LIMIT = 100
+
+# 卡片详情的进程内 TTL 缓存：card_id -> (过期时间, card)
+CARD_CACHE_TTL = 60
+CARD_CACHE_SIZE = 1024
+card_cache = {}
+
+# 反范式化存入 user-cards 的卡片字段，读取钱包时只需一次 Query
+WALLET_ATTRIBUTES = ('card_name', 'bank', 'cashback_categories', 'image_url', 'benefits')
+WALLET_PROJECTION = ', '.join(WALLET_ATTRIBUTES)
 
 # ============ Cards 表操作 ============
 
@@ -31,22 +67,166 @@ def create_card(card_id, card_data):
         'benefits': ['旅行保险', '租车保险', '免费酒店会员'],
         'image_url': 'https://example.com/card.jpg'
     })
+
+    卡片已存在时事务被取消（TransactionCanceledException），修改已有卡片请用 update_card
     """
+    cashback_categories = card_data.get('cashback_categories', {})
+    validate_cashback_categories(cashback_categories)
+
     item = {
         'card_id': card_id,
-        'created_at': datetime.now().isoformat(),
+        'created_at': now_millis(),
         **card_data
     }
 
-    response = cards_table.put_item(Item=item)
+    # 卡片和类别行放在同一个事务中写入，避免只写入一半；
+    # 不覆盖已有卡片，否则旧类别行会残留在类别表中
+    transact_items = [{'Put': {
+        'TableName': cards_table.name,
+        'Item': serialize_item(item),
+        'ConditionExpression': 'attribute_not_exists(card_id)'
+    }}]
+    transact_items.extend({'Put': {
+        'TableName': card_categories_table.name,
+        'Item': serialize_item({
+            'category': category,
+            'card_id': card_id,
+            'rate': info['rate']
+        })
+    }} for category, info in cashback_categories.items())
+
+    response = client.transact_write_items(TransactItems=transact_items)
+    card_cache.pop(card_id, None)
     return response
 
 def get_card(card_id):
     """
-    获取单张卡片信息
+    获取单张卡片信息（优先读取 TTL 缓存，返回副本以免调用方修改缓存）
     """
-    response = cards_table.get_item(Key={'card_id': card_id})
-    return response.get('Item', None)
+    card = get_cached_card(card_id)
+    if card is None:
+        card = fetch_card(card_id)
+        if card:
+            cache_card(card)
+    return card.copy() if card else None
+
+def fetch_card(card_id):
+    """
+    直接从 DynamoDB 读取单张卡片信息（不经过缓存）
+    """
+    response = client.get_item(
+        TableName=cards_table.name,
+        Key={'card_id': {'S': card_id}}
+    )
+    item = response.get('Item')
+    return deserialize_item(item) if item else None
+
+def get_card_summary(card_id):
+    """
+    获取卡片的钱包字段（缓存未命中时只读取 WALLET_PROJECTION）
+    """
+    card = get_cached_card(card_id)
+    if card is not None:
+        return card.copy()
+
+    response = client.get_item(
+        TableName=cards_table.name,
+        Key={'card_id': {'S': card_id}},
+        ProjectionExpression=WALLET_PROJECTION
+    )
+    item = response.get('Item')
+    return deserialize_item(item) if item else None
+
+def batch_get_cards(card_ids):
+    """
+    批量获取卡片信息（BatchGetItem，每批最多 100 个 key）
+
+    返回 {card_id: card} 字典，不存在的卡片不会出现在结果中；缓存命中的卡片不再请求
+    返回的卡片都是缓存的副本
+    """
+    cards = {}
+    keys = []
+    for card_id in dict.fromkeys(card_ids):
+        card = get_cached_card(card_id)
+        if card is None:
+            keys.append({'card_id': card_id})
+        else:
+            cards[card_id] = card.copy()
+
+    for start in range(0, len(keys), BATCH_GET_LIMIT):
+        request_items = {cards_table.name: {'Keys': keys[start:start + BATCH_GET_LIMIT]}}
+        attempt = 0
+
+        while request_items:
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            for card in response.get('Responses', {}).get(cards_table.name, []):
+                cards[card['card_id']] = card.copy()
+                cache_card(card)
+
+            # 未处理的 key 需要退避重试，超过 BATCH_RETRY_MAX_ATTEMPTS 次则报错
+            request_items = response.get('UnprocessedKeys')
+            if request_items:
+                if attempt >= BATCH_RETRY_MAX_ATTEMPTS:
+                    raise RuntimeError(
+                        f"BatchGetItem still had unprocessed keys after {attempt} retries"
+                    )
+                time.sleep(min(BATCH_RETRY_BASE_DELAY * (2 ** attempt), BATCH_RETRY_MAX_DELAY))
+                attempt += 1
+
+    return cards
+
+def seed_cards_and_user_cards(cards, user_cards):
+    """
+    用一次 TransactWriteItems 原子写入卡片、类别表和用户卡片
+
+    cards: {card_id: card_data}，card_data 格式同 create_card
+    user_cards: [(user_id, card_id, card_info)]，card_id 必须在 cards 中
+    任一卡片或用户卡片已存在时整个事务被取消（TransactionCanceledException）
+    """
+    created_at = now_millis()
+    transact_items = []
+
+    for card_id, card_data in cards.items():
+        validate_cashback_categories(card_data.get('cashback_categories', {}))
+        card = {'card_id': card_id, 'created_at': created_at, **card_data}
+        transact_items.append({'Put': {
+            'TableName': cards_table.name,
+            'Item': serialize_item(card),
+            'ConditionExpression': 'attribute_not_exists(card_id)'
+        }})
+        for category, info in card_data.get('cashback_categories', {}).items():
+            transact_items.append({'Put': {
+                'TableName': card_categories_table.name,
+                'Item': serialize_item({
+                    'category': category,
+                    'card_id': card_id,
+                    'rate': info['rate']
+                })
+            }})
+
+    for user_id, card_id, card_info in user_cards:
+        card_data = cards[card_id]
+        user_card = {
+            'user_id': user_id,
+            'card_id': card_id,
+            'added_date': created_at,
+            'card_status': 'active',
+            **{attr: card_data[attr] for attr in WALLET_ATTRIBUTES if attr in card_data},
+            **card_info
+        }
+        transact_items.append({'Put': {
+            'TableName': user_cards_table.name,
+            'Item': serialize_item(user_card),
+            'ConditionExpression': 'attribute_not_exists(user_id)'
+        }})
+
+    if len(transact_items) > TRANSACT_WRITE_LIMIT:
+        raise ValueError(f"Too many items for one transaction: {len(transact_items)}")
+
+    response = client.transact_write_items(TransactItems=transact_items)
+    for card_id in cards:
+        card_cache.pop(card_id, None)
+    return response
 
 def get_all_cards():
     """
@@ -59,39 +239,128 @@ def update_card(card_id, update_data):
     """
     更新卡片信息
     """
-    update_expression = "SET "
-    expression_values = {}
-
-    for key, value in update_data.items():
-        update_expression += f"{key} = :{key}, "
-        expression_values[f":{key}"] = value
-
-    update_expression = update_expression.rstrip(", ")
+    # 返现类别变化时需要同步类别表，先校验格式并记下旧的类别
+    old_categories = {}
+    if 'cashback_categories' in update_data:
+        validate_cashback_categories(update_data['cashback_categories'])
+        old_card = fetch_card(card_id) or {}
+        old_categories = old_card.get('cashback_categories', {})
 
     response = cards_table.update_item(
         Key={'card_id': card_id},
-        UpdateExpression=update_expression,
-        ExpressionAttributeValues=expression_values,
-        ReturnValues="ALL_NEW"
+        ReturnValues="ALL_NEW",
+        **build_update_expression(update_data)
     )
+
+    if 'cashback_categories' in update_data:
+        new_categories = update_data['cashback_categories']
+        delete_card_categories(card_id, [c for c in old_categories if c not in new_categories])
+        put_card_categories(card_id, new_categories)
+
+    # 同步反范式化到 user-cards 的字段
+    wallet_updates = {key: value for key, value in update_data.items() if key in WALLET_ATTRIBUTES}
+    if wallet_updates:
+        sync_user_cards(card_id, wallet_updates)
+
+    card_cache.pop(card_id, None)
     return response
 
 def delete_card(card_id):
     """
     删除卡片信息
     """
-    response = cards_table.delete_item(Key={'card_id': card_id})
+    response = cards_table.delete_item(
+        Key={'card_id': card_id},
+        ReturnValues='ALL_OLD'
+    )
+    old_card = response.get('Attributes', {})
+    delete_card_categories(card_id, old_card.get('cashback_categories', {}))
+    # user-cards 中存有卡片副本，一并删除
+    delete_card_holders(card_id)
+    card_cache.pop(card_id, None)
     return response
 
 def search_cards_by_category(category):
     """
-    根据返现类别搜索卡片（需要扫描）
+    根据返现类别搜索卡片（查询类别表，再批量获取卡片）
+
+    依赖类别表：已有部署需先运行一次 backfill_card_categories，否则旧卡片搜不到
     """
-    response = cards_table.scan(
-        FilterExpression='attribute_exists(cashback_categories.#cat)',
-        ExpressionAttributeNames={'#cat': category}
+    response = card_categories_table.query(
+        KeyConditionExpression=Key('category').eq(category)
     )
-    return response.get('Items', [])
+    card_ids = [item['card_id'] for item in response.get('Items', [])]
+
+    while 'LastEvaluatedKey' in response:
+        response = card_categories_table.query(
+            KeyConditionExpression=Key('category').eq(category),
+            ExclusiveStartKey=response['LastEvaluatedKey']
+        )
+        card_ids.extend(item['card_id'] for item in response.get('Items', []))
+
+    cards = batch_get_cards(card_ids)
+    return [cards[card_id] for card_id in card_ids if card_id in cards]
+
+# ============ Card-Categories 表操作 ============
+
+def validate_cashback_categories(cashback_categories):
+    """
+    校验返现类别格式为 {category: {'rate': 数字}}，不合法时抛出 ValueError
+    """
+    if not isinstance(cashback_categories, dict):
+        raise ValueError("cashback_categories must be a dict")
+    if len(cashback_categories) >= TRANSACT_WRITE_LIMIT:
+        raise ValueError(f"cashback_categories can have at most {TRANSACT_WRITE_LIMIT - 1} entries")
+
+    for category, info in cashback_categories.items():
+        rate = info.get('rate') if isinstance(info, dict) else None
+        if not category or isinstance(rate, bool) or not isinstance(rate, (int, Decimal)):
+            raise ValueError(f"Invalid cashback category: {category}")
+
+def put_card_categories(card_id, cashback_categories):
+    """
+    将卡片的每个返现类别写入类别表，供按类别查询使用
+    """
+    with card_categories_table.batch_writer() as batch:
+        for category, info in cashback_categories.items():
+            batch.put_item(Item={
+                'category': category,
+                'card_id': card_id,
+                'rate': info['rate']
+            })
+
+def delete_card_categories(card_id, categories):
+    """
+    从类别表中删除卡片的指定类别
+    """
+    with card_categories_table.batch_writer() as batch:
+        for category in categories:
+            batch.delete_item(Key={'category': category, 'card_id': card_id})
+
+def backfill_card_categories():
+    """
+    一次性迁移：扫描 cards 表，为已有卡片补写类别表
+
+    类别表只由新版本的写操作维护，部署前已存在的卡片需要先运行一次；
+    重复运行是安全的（相同主键的行会被覆盖）。返回处理的卡片数
+    """
+    scan_params = {'ProjectionExpression': 'card_id, cashback_categories'}
+    count = 0
+
+    while True:
+        response = cards_table.scan(**scan_params)
+        for card in response.get('Items', []):
+            cashback_categories = card.get('cashback_categories', {})
+            try:
+                validate_cashback_categories(cashback_categories)
+            except ValueError as e:
+                raise ValueError(f"Card {card['card_id']}: {e}") from e
+            put_card_categories(card['card_id'], cashback_categories)
+            count += 1
+
+        if 'LastEvaluatedKey' not in response:
+            return count
+        scan_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
 
 # ============ User-Cards 表操作 ============
 
@@ -107,20 +376,21 @@ def add_card_to_user(user_id, card_id, card_info=None):
         'last_four_digits': '1234'
     })
     """
-    # 如果没有提供卡片信息，从 cards 表获取
-    if not card_info:
-        card = get_card(card_id)
+    # 卡片详情反范式化存入 user-cards；card_info 缺少的字段从 cards 表补齐
+    card_info = card_info or {}
+    if not all(attr in card_info for attr in WALLET_ATTRIBUTES):
+        card = get_card_summary(card_id)
         if not card:
             raise ValueError(f"Card {card_id} not found")
         card_info = {
-            'card_name': card['card_name'],
-            'bank': card['bank']
+            **{attr: card[attr] for attr in WALLET_ATTRIBUTES if attr in card},
+            **card_info
         }
 
     item = {
         'user_id': user_id,
         'card_id': card_id,
-        'added_date': datetime.now().isoformat(),
+        'added_date': now_millis(),
         'card_status': 'active',
         **card_info
     }
@@ -137,6 +407,57 @@ def get_user_cards(user_id):
     )
     return response.get('Items', [])
 
+def query_card_holders(card_id):
+    """
+    通过 card_id-user_id-index 查询持有该卡的所有 user-cards 记录的主键
+    """
+    response = user_cards_table.query(
+        IndexName=CARD_USERS_INDEX,
+        KeyConditionExpression=Key('card_id').eq(card_id),
+        ProjectionExpression='user_id, card_id'
+    )
+    user_cards = response.get('Items', [])
+
+    while 'LastEvaluatedKey' in response:
+        response = user_cards_table.query(
+            IndexName=CARD_USERS_INDEX,
+            KeyConditionExpression=Key('card_id').eq(card_id),
+            ProjectionExpression='user_id, card_id',
+            ExclusiveStartKey=response['LastEvaluatedKey']
+        )
+        user_cards.extend(response.get('Items', []))
+
+    return user_cards
+
+def sync_user_cards(card_id, wallet_updates):
+    """
+    将卡片字段的变更写入所有持有该卡的 user-cards 记录
+
+    GSI 是最终一致的：只 SET 变更的字段，并要求记录仍然存在，
+    避免覆盖用户的并发修改或恢复已被移除的卡片
+    """
+    update_params = build_update_expression(wallet_updates)
+
+    for user_card in query_card_holders(card_id):
+        try:
+            user_cards_table.update_item(
+                Key={'user_id': user_card['user_id'], 'card_id': card_id},
+                ConditionExpression='attribute_exists(user_id)',
+                **update_params
+            )
+        except ClientError as e:
+            # 用户已经移除了这张卡
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+
+def delete_card_holders(card_id):
+    """
+    从所有用户的钱包中删除该卡
+    """
+    with user_cards_table.batch_writer() as batch:
+        for user_card in query_card_holders(card_id):
+            batch.delete_item(Key={'user_id': user_card['user_id'], 'card_id': card_id})
+
 def get_user_card(user_id, card_id):
     """
     获取用户的特定卡片
@@ -153,23 +474,13 @@ def update_user_card(user_id, card_id, update_data):
     """
     更新用户的卡片信息（如备注、状态等）
     """
-    update_expression = "SET "
-    expression_values = {}
-
-    for key, value in update_data.items():
-        update_expression += f"{key} = :{key}, "
-        expression_values[f":{key}"] = value
-
-    update_expression = update_expression.rstrip(", ")
-
     response = user_cards_table.update_item(
         Key={
             'user_id': user_id,
             'card_id': card_id
         },
-        UpdateExpression=update_expression,
-        ExpressionAttributeValues=expression_values,
-        ReturnValues="ALL_NEW"
+        ReturnValues="ALL_NEW",
+        **build_update_expression(update_data)
     )
     return response
 
@@ -196,104 +507,168 @@ def get_user_active_cards(user_id):
     )
     return response.get('Items', [])
 
+# ============ 工具函数 ============
+
+def build_update_expression(update_data):
+    """
+    根据待更新字段生成 update_item 参数
+
+    属性名统一用 #k 占位，避免与 DynamoDB 保留字冲突
+    """
+    names = {f'#k{i}': key for i, key in enumerate(update_data)}
+    values = {f':v{i}': value for i, value in enumerate(update_data.values())}
+    return {
+        'UpdateExpression': 'SET ' + ', '.join(f'{n} = {v}' for n, v in zip(names, values)),
+        'ExpressionAttributeNames': names,
+        'ExpressionAttributeValues': values
+    }
+
+def get_cached_card(card_id):
+    """
+    从 TTL 缓存读取卡片，未命中或已过期返回 None
+    """
+    entry = card_cache.get(card_id)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+def cache_card(card):
+    """
+    写入 TTL 缓存，满了就淘汰最早写入的卡片
+    """
+    card_cache.pop(card['card_id'], None)
+    if len(card_cache) >= CARD_CACHE_SIZE:
+        card_cache.pop(next(iter(card_cache)))
+    card_cache[card['card_id']] = (time.monotonic() + CARD_CACHE_TTL, card)
+
+def now_millis():
+    """
+    当前时间的毫秒级 epoch（DynamoDB Number，可直接作为排序键）
+    """
+    return Decimal(int(time.time() * 1000))
+
+def serialize_item(item):
+    """
+    将 Python 对象转换为低层 client 需要的 DynamoDB 类型描述
+    """
+    return {key: serializer.serialize(value) for key, value in item.items()}
+
+def deserialize_item(item):
+    """
+    将低层 client 返回的 DynamoDB 类型描述转换为 Python 对象
+    """
+    return {key: deserializer.deserialize(value) for key, value in item.items()}
+
 # ============ 高级查询 ============
 
 def get_user_cards_with_details(user_id):
     """
-    获取用户卡片及完整的卡片详情（联表查询）
+    获取用户卡片及卡片详情（详情已反范式化存入 user-cards，一次 Query 即可）
     """
     # 获取用户的卡片
     user_cards = get_user_cards(user_id)
 
-    # 获取每张卡的详细信息
+    # 旧记录没有反范式化的详情，仍需批量获取
+    legacy_ids = [user_card['card_id'] for user_card in user_cards
+                  if 'cashback_categories' not in user_card]
+    cards = batch_get_cards(legacy_ids) if legacy_ids else {}
+
     result = []
     for user_card in user_cards:
-        card_details = get_card(user_card['card_id'])
+        if 'cashback_categories' in user_card:
+            card_details = user_card
+        else:
+            card_details = cards.get(user_card['card_id'])
         if card_details:
-            # 合并用户卡片信息和卡片详情
-            combined = {
-                **card_details,
-                'user_notes': user_card.get('notes', ''),
-                'user_status': user_card.get('card_status', 'active'),
-                'added_date': user_card.get('added_date', ''),
-                'last_four_digits': user_card.get('last_four_digits', '')
-            }
+            # 两种记录返回相同结构：card_id + 钱包字段 + 用户字段
+            combined = {'card_id': user_card['card_id']}
+            combined.update((attr, card_details[attr]) for attr in WALLET_ATTRIBUTES if attr in card_details)
+            combined.update(
+                user_notes=user_card.get('notes', ''),
+                user_status=user_card.get('card_status', 'active'),
+                added_date=user_card.get('added_date', ''),
+                last_four_digits=user_card.get('last_four_digits', '')
+            )
             result.append(combined)
 
     return result
 
 def recommend_best_card_for_category(category):
     """
-    推荐某个类别返现最高的卡
+    推荐某个类别返现最高的卡（查询 category-rate-index，按 rate 降序取第一条）
     """
-    all_cards = get_all_cards()
-
-    best_card = None
-    highest_rate = 0
-
-    for card in all_cards:
-        categories = card.get('cashback_categories', {})
-        if category in categories:
-            rate = categories[category].get('rate', 0)
-            if rate > highest_rate:
-                highest_rate = rate
-                best_card = card
+    response = card_categories_table.query(
+        IndexName=CATEGORY_RATE_INDEX,
+        KeyConditionExpression=Key('category').eq(category),
+        ScanIndexForward=False,
+        Limit=1
+    )
+    items = response.get('Items', [])
+    if not items or items[0]['rate'] <= 0:
+        return None
 
-    return best_card
+    # 类别行可能比卡片本身旧，确认卡片仍提供该类别
+    card = get_card(items[0]['card_id'])
+    if not card or category not in card.get('cashback_categories', {}):
+        return None
+    return card
 
 # ============ 使用示例 ============
 
 if __name__ == "__main__":
-    # 1. 创建几张银行卡
-    print("Creating cards...")
-
-    create_card('chase-sapphire-preferred', {
-        'card_name': 'Chase Sapphire Preferred',
-        'bank': 'Chase',
-        'card_type': 'Credit Card',
-        'annual_fee': 95,
-        'cashback_categories': {
-            'dining': {'rate': 3, 'description': '餐饮3%返现'},
-            'travel': {'rate': 3, 'description': '旅行3%返现'},
-            'streaming': {'rate': 3, 'description': '流媒体3%返现'},
-            'default': {'rate': 1, 'description': '其他消费1%返现'}
-        },
-        'signup_bonus': '60000 points',
-        'benefits': ['旅行保险', '租车保险', 'Priority Pass'],
-        'image_url': 'https://example.com/chase-sapphire.jpg'
-    })
-
-    create_card('amex-gold', {
-        'card_name': 'American Express Gold Card',
-        'bank': 'American Express',
-        'card_type': 'Credit Card',
-        'annual_fee': 250,
-        'cashback_categories': {
-            'dining': {'rate': 4, 'description': '餐饮4倍积分'},
-            'grocery': {'rate': 4, 'description': '超市4倍积分'},
-            'default': {'rate': 1, 'description': '其他消费1倍积分'}
-        },
-        'signup_bonus': '60000 points',
-        'benefits': ['餐饮积分', '超市积分', 'Uber Credits'],
-        'image_url': 'https://example.com/amex-gold.jpg'
-    })
-
-    # 2. 为用户添加卡片
-    print("\nAdding cards to user...")
-
-    add_card_to_user('user-001', 'chase-sapphire-preferred', {
-        'card_name': 'Chase Sapphire Preferred',
-        'bank': 'Chase',
-        'notes': '主力旅行卡',
-        'last_four_digits': '1234'
-    })
-
-    add_card_to_user('user-001', 'amex-gold', {
-        'card_name': 'American Express Gold Card',
-        'bank': 'American Express',
-        'notes': '吃饭专用',
-        'last_four_digits': '5678'
-    })
+    # 1. 创建几张银行卡，2. 为用户添加卡片（同一个事务，一次请求）
+    print("Seeding cards and user cards...")
+
+    try:
+        seed_cards_and_user_cards(
+            {
+                'chase-sapphire-preferred': {
+                    'card_name': 'Chase Sapphire Preferred',
+                    'bank': 'Chase',
+                    'card_type': 'Credit Card',
+                    'annual_fee': 95,
+                    'cashback_categories': {
+                        'dining': {'rate': 3, 'description': '餐饮3%返现'},
+                        'travel': {'rate': 3, 'description': '旅行3%返现'},
+                        'streaming': {'rate': 3, 'description': '流媒体3%返现'},
+                        'default': {'rate': 1, 'description': '其他消费1%返现'}
+                    },
+                    'signup_bonus': '60000 points',
+                    'benefits': ['旅行保险', '租车保险', 'Priority Pass'],
+                    'image_url': 'https://example.com/chase-sapphire.jpg'
+                },
+                'amex-gold': {
+                    'card_name': 'American Express Gold Card',
+                    'bank': 'American Express',
+                    'card_type': 'Credit Card',
+                    'annual_fee': 250,
+                    'cashback_categories': {
+                        'dining': {'rate': 4, 'description': '餐饮4倍积分'},
+                        'grocery': {'rate': 4, 'description': '超市4倍积分'},
+                        'default': {'rate': 1, 'description': '其他消费1倍积分'}
+                    },
+                    'signup_bonus': '60000 points',
+                    'benefits': ['餐饮积分', '超市积分', 'Uber Credits'],
+                    'image_url': 'https://example.com/amex-gold.jpg'
+                }
+            },
+            [
+                ('user-001', 'chase-sapphire-preferred', {
+                    'notes': '主力旅行卡',
+                    'last_four_digits': '1234'
+                }),
+                ('user-001', 'amex-gold', {
+                    'notes': '吃饭专用',
+                    'last_four_digits': '5678'
+                })
+            ]
+        )
+    except client.exceptions.TransactionCanceledException as e:
+        # 只有条件检查失败（数据已存在）才跳过，其他取消原因继续抛出
+        codes = {reason.get('Code') for reason in e.response.get('CancellationReasons', [])}
+        if 'ConditionalCheckFailed' not in codes or not codes <= {'None', 'ConditionalCheckFailed'}:
+            raise
+        print("Demo data already exists, skipping seed")
 
     # 3. 查询用户的所有卡片
     print("\nUser's cards:")
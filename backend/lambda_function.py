@@ -1,13 +1,77 @@
 import json
+import re
+import time
 import boto3
 import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from decimal import Decimal
-from datetime import datetime
 
-# Initialize AWS services
-dynamodb = boto3.resource('dynamodb')
+# orjson is optional; without it responses fall back to the stdlib encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Initialize AWS services at module scope so warm invocations reuse connections.
+# botocore's pooled urllib3 session keeps TCP+TLS connections alive between
+# invocations; tcp_keepalive stops idle pooled sockets from being silently
+# dropped while the container is frozen. (botocore has no CRT HTTP client for
+# DynamoDB, so awscrt is not used here.)
+dynamodb_config = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    connect_timeout=1,
+    read_timeout=3
+)
+dynamodb = boto3.resource('dynamodb', config=dynamodb_config)
+# Low-level client for hot reads; resource.meta.client has the high-level
+# (de)serialization hooks attached, so it cannot take raw attribute values
+client = boto3.client('dynamodb', config=dynamodb_config)
+deserializer = TypeDeserializer()
+serializer = TypeSerializer()
 cards_table = dynamodb.Table(os.environ.get('CARDS_TABLE', 'cards'))
 user_cards_table = dynamodb.Table(os.environ.get('USER_CARDS_TABLE', 'user-cards'))
+# GSI on user-cards (card_id, user_id) used to find every wallet holding a card
+CARD_USERS_INDEX = 'card_id-user_id-index'
+# One row per (category, card_id) with the rate, indexed by category-rate-index
+card_categories_table = dynamodb.Table(os.environ.get('CARD_CATEGORIES_TABLE', 'card-categories'))
+
+# Strings matching this are stored as DynamoDB numbers
+NUMERIC_STRING = re.compile(r'-?\d+(?:\.\d+)?')
+
+# Parallel scan segments used to load the cards catalog
+SCAN_SEGMENTS = int(os.environ.get('SCAN_SEGMENTS', '4'))
+# Seconds a warm container keeps serving the cached catalog (as encoded JSON).
+# Off by default: writes only invalidate the container that handled them, so
+# other containers would serve a stale list right after a create/delete
+CARDS_CACHE_TTL = int(os.environ.get('CARDS_CACHE_TTL', '0'))
+cards_cache = {'body': None, 'expires_at': 0}
+
+# Per-card TTL cache for hot card_id lookups: card_id -> (expires_at, card).
+# Cached cards hold float numbers, so they must never be written back to DynamoDB
+CARD_CACHE_TTL = int(os.environ.get('CARD_CACHE_TTL', '60'))
+CARD_CACHE_SIZE = 1024
+card_cache = {}
+
+# Card attributes denormalized into each user-cards row, so a wallet is
+# served by a single Query without joining against the cards table
+WALLET_ATTRIBUTES = ('card_name', 'bank', 'cashback_categories', 'image_url', 'benefits')
+WALLET_PROJECTION = ', '.join(WALLET_ATTRIBUTES)
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_LIMIT = 100
+BATCH_RETRY_BASE_DELAY = 0.05
+BATCH_RETRY_MAX_DELAY = 1.0
+BATCH_RETRY_MAX_ATTEMPTS = 8
+
+# TransactWriteItems accepts at most 100 operations (the card + its categories)
+TRANSACT_WRITE_LIMIT = 100
 
 # Custom JSON encoder for DynamoDB Decimal types
 class DecimalEncoder(json.JSONEncoder):
@@ -16,6 +80,26 @@ class DecimalEncoder(json.JSONEncoder):
             return float(obj)
         return super(DecimalEncoder, self).default(obj)
 
+# Deserializer that yields numbers as float, for items only sent back as JSON;
+# read paths that only feed responses skip the Decimal -> float round trip
+class FloatDeserializer(TypeDeserializer):
+    def _deserialize_n(self, value):
+        return float(value)
+
+response_deserializer = FloatDeserializer()
+
+def decimal_default(obj):
+    """orjson default hook for DynamoDB Decimal values"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+def dumps(obj):
+    """Serialize to a JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=decimal_default).decode()
+    return json.dumps(obj, cls=DecimalEncoder)
+
 # CORS headers
 CORS_HEADERS = {
     'Access-Control-Allow-Origin': '*',
@@ -23,6 +107,24 @@ CORS_HEADERS = {
     'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
 }
 
+# CORS preflight response is identical for every request
+OPTIONS_RESPONSE = {
+    'statusCode': 200,
+    'headers': CORS_HEADERS,
+    'body': ''
+}
+
+# Pre-serialized bodies for fixed error/success messages
+STATIC_BODIES = {
+    'card_not_found': dumps({'error': 'Card not found'}),
+    'card_exists': dumps({'error': 'Card ID already exists'}),
+    'card_deleted': dumps({'message': 'Card deleted successfully'}),
+    'missing_card_id': dumps({'error': 'Missing card_id'}),
+    'user_card_exists': dumps({'error': 'User already has this card'}),
+    'user_card_not_found': dumps({'error': 'Card not found in user wallet'}),
+    'user_card_removed': dumps({'message': 'Card removed from wallet successfully'})
+}
+
 def lambda_handler(event, context):
     """
     Main Lambda handler for CardMan API
@@ -44,44 +146,14 @@ def lambda_handler(event, context):
 
     # Handle OPTIONS (CORS preflight)
     if method == 'OPTIONS':
-        return {
-            'statusCode': 200,
-            'headers': CORS_HEADERS,
-            'body': ''
-        }
+        return OPTIONS_RESPONSE
 
     try:
-        # Route to appropriate handler
-        if path == '/api/cards':
-            if method == 'GET':
-                return get_all_cards()
-            elif method == 'POST':
-                body_data = json.loads(body) if body else {}
-                return create_card(body_data)
-
-        elif path.startswith('/api/cards/') and len(path.split('/')) == 4:
-            card_id = path.split('/')[-1]
-            if method == 'GET':
-                return get_card(card_id)
-            elif method == 'DELETE':
-                return delete_card(card_id)
-
-        elif path.startswith('/api/users/') and path.endswith('/cards'):
-            # /api/users/{user_id}/cards
-            user_id = path.split('/')[-2]
-            if method == 'GET':
-                return get_user_cards(user_id)
-            elif method == 'POST':
-                body_data = json.loads(body) if body else {}
-                return add_card_to_user(user_id, body_data)
-
-        elif path.startswith('/api/users/') and path.count('/') == 5:
-            # /api/users/{user_id}/cards/{card_id}
-            parts = path.split('/')
-            user_id = parts[3]
-            card_id = parts[5]
-            if method == 'DELETE':
-                return remove_card_from_user(user_id, card_id)
+        # Route to appropriate handler with a single lookup on the path shape
+        shape, params = parse_path(path)
+        handler = ROUTES.get(shape, {}).get(method)
+        if handler and all(params):
+            return handler(params, body)
 
         # Route not found
         return response(404, {'error': 'Route not found', 'path': path, 'method': method})
@@ -97,27 +169,66 @@ def lambda_handler(event, context):
 def get_all_cards():
     """Get all cards from the cards table"""
     try:
-        result = cards_table.scan()
-        items = result.get('Items', [])
+        # With caching disabled, don't keep a catalog-sized string alive between requests
+        if CARDS_CACHE_TTL <= 0:
+            return response(200, build_cards_body())
 
-        # Handle pagination if there are many items
-        while 'LastEvaluatedKey' in result:
-            result = cards_table.scan(ExclusiveStartKey=result['LastEvaluatedKey'])
-            items.extend(result.get('Items', []))
+        # Serve the catalog from memory until the TTL expires
+        now = time.monotonic()
+        if cards_cache['body'] is None or now >= cards_cache['expires_at']:
+            cards_cache['body'] = build_cards_body()
+            cards_cache['expires_at'] = now + CARDS_CACHE_TTL
 
-        return response(200, {'cards': items})
+        return response(200, cards_cache['body'])
     except Exception as e:
         return response(500, {'error': f'Failed to get cards: {str(e)}'})
 
+def build_cards_body():
+    """Encode the full catalog as the GET /api/cards response body"""
+    return '{"cards":[' + ','.join(scan_all_cards()) + ']}'
+
+def iter_segment(segment, total_segments):
+    """Yield the cards of one parallel-scan segment, one page at a time"""
+    # Uses the low-level client, which (unlike resources) is thread-safe
+    params = {
+        'TableName': cards_table.name,
+        'Segment': segment,
+        'TotalSegments': total_segments
+    }
+    result = client.scan(**params)
+    for item in result.get('Items', []):
+        yield deserialize_for_response(item)
+
+    while 'LastEvaluatedKey' in result:
+        result = client.scan(ExclusiveStartKey=result['LastEvaluatedKey'], **params)
+        for item in result.get('Items', []):
+            yield deserialize_for_response(item)
+
+def scan_segment(segment, total_segments):
+    """JSON-encode each card of a segment as it streams in, so only one page is held as dicts"""
+    return [dumps(card) for card in iter_segment(segment, total_segments)]
+
+def scan_all_cards():
+    """Scan the whole cards table with SCAN_SEGMENTS parallel segments, returning encoded cards"""
+    with ThreadPoolExecutor(max_workers=SCAN_SEGMENTS) as executor:
+        futures = [executor.submit(scan_segment, segment, SCAN_SEGMENTS)
+                   for segment in range(SCAN_SEGMENTS)]
+        return list(chain.from_iterable(future.result() for future in futures))
+
+def invalidate_cards_cache():
+    """Drop the cached catalog after a write in this container"""
+    cards_cache['body'] = None
+    cards_cache['expires_at'] = 0
+
 def get_card(card_id):
     """Get a specific card by ID"""
     try:
-        result = cards_table.get_item(Key={'card_id': card_id})
+        card = load_card(card_id)
 
-        if 'Item' not in result:
-            return response(404, {'error': 'Card not found'})
+        if not card:
+            return response(404, STATIC_BODIES['card_not_found'])
 
-        return response(200, result['Item'])
+        return response(200, card)
     except Exception as e:
         return response(500, {'error': f'Failed to get card: {str(e)}'})
 
@@ -130,38 +241,42 @@ def create_card(data):
             if field not in data:
                 return response(400, {'error': f'Missing required field: {field}'})
 
-        # Check if card already exists
-        existing = cards_table.get_item(Key={'card_id': data['card_id']})
-        if 'Item' in existing:
-            return response(400, {'error': 'Card ID already exists'})
-
-        # Convert float and numeric strings to Decimal for DynamoDB
-        def convert_to_decimal(obj):
-            if isinstance(obj, float):
-                return Decimal(str(obj))
-            elif isinstance(obj, str):
-                # Try to convert numeric strings to Decimal
-                try:
-                    # Check if string looks like a number
-                    if obj.replace('.', '', 1).replace('-', '', 1).isdigit():
-                        return Decimal(obj)
-                except:
-                    pass
-                return obj
-            elif isinstance(obj, dict):
-                return {k: convert_to_decimal(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_to_decimal(item) for item in obj]
-            return obj
-
-        # Add metadata and convert types
+        # Add metadata and convert float / numeric strings to Decimal for DynamoDB
         item = convert_to_decimal({
             **data,
-            'created_at': datetime.now().isoformat()
+            'created_at': now_millis()
         })
 
-        # Save to DynamoDB
-        cards_table.put_item(Item=item)
+        # Category rows are keyed on the rate, so reject bad input before writing
+        error = validate_cashback_categories(item['cashback_categories'])
+        if error:
+            return response(400, {'error': error})
+
+        # Save the card and its card-categories rows atomically, rejecting
+        # duplicates in the same round trip
+        transact_items = [{'Put': {
+            'TableName': cards_table.name,
+            'Item': serialize_item(item),
+            'ConditionExpression': 'attribute_not_exists(card_id)'
+        }}]
+        transact_items.extend({'Put': {
+            'TableName': card_categories_table.name,
+            'Item': serialize_item({
+                'category': category,
+                'card_id': item['card_id'],
+                'rate': info['rate']
+            })
+        }} for category, info in item['cashback_categories'].items())
+
+        try:
+            client.transact_write_items(TransactItems=transact_items)
+        except client.exceptions.TransactionCanceledException as e:
+            reasons = e.response.get('CancellationReasons', [])
+            if reasons and reasons[0].get('Code') == 'ConditionalCheckFailed':
+                return response(400, STATIC_BODIES['card_exists'])
+            raise
+        invalidate_cards_cache()
+        card_cache.pop(item['card_id'], None)
 
         return response(201, {'message': 'Card created successfully', 'card': item})
 
@@ -174,43 +289,102 @@ def delete_card(card_id):
         # Check if card exists
         result = cards_table.get_item(Key={'card_id': card_id})
         if 'Item' not in result:
-            return response(404, {'error': 'Card not found'})
+            return response(404, STATIC_BODIES['card_not_found'])
 
         # Delete from cards table
         cards_table.delete_item(Key={'card_id': card_id})
+        delete_card_categories(card_id, result['Item'].get('cashback_categories', {}))
+        # Wallet rows carry a copy of the card, so remove them too
+        delete_card_holders(card_id)
+        invalidate_cards_cache()
+        card_cache.pop(card_id, None)
 
-        return response(200, {'message': 'Card deleted successfully'})
+        return response(200, STATIC_BODIES['card_deleted'])
 
     except Exception as e:
         return response(500, {'error': f'Failed to delete card: {str(e)}'})
 
+# ============ Card Categories Table Operations ============
+
+def validate_cashback_categories(cashback_categories):
+    """Return an error message unless cashback_categories is {category: {'rate': number}}"""
+    if not isinstance(cashback_categories, dict):
+        return 'cashback_categories must be an object'
+    if len(cashback_categories) >= TRANSACT_WRITE_LIMIT:
+        return f'cashback_categories can have at most {TRANSACT_WRITE_LIMIT - 1} entries'
+
+    for category, info in cashback_categories.items():
+        rate = info.get('rate') if isinstance(info, dict) else None
+        if not category or isinstance(rate, bool) or not isinstance(rate, (int, Decimal)):
+            return f'Invalid cashback category: {category}'
+
+    return None
+
+def delete_card_categories(card_id, categories):
+    """Remove a card's rows from the card-categories table"""
+    with card_categories_table.batch_writer() as batch:
+        for category in categories:
+            batch.delete_item(Key={'category': category, 'card_id': card_id})
+
 # ============ User Cards Table Operations ============
 
+def query_card_holders(card_id):
+    """Get the keys of every user-cards row holding a card"""
+    params = {
+        'IndexName': CARD_USERS_INDEX,
+        'KeyConditionExpression': Key('card_id').eq(card_id),
+        'ProjectionExpression': 'user_id, card_id'
+    }
+    result = user_cards_table.query(**params)
+    holders = result.get('Items', [])
+
+    while 'LastEvaluatedKey' in result:
+        result = user_cards_table.query(ExclusiveStartKey=result['LastEvaluatedKey'], **params)
+        holders.extend(result.get('Items', []))
+
+    return holders
+
+def delete_card_holders(card_id):
+    """Remove a card from every user's wallet"""
+    with user_cards_table.batch_writer() as batch:
+        for holder in query_card_holders(card_id):
+            batch.delete_item(Key={'user_id': holder['user_id'], 'card_id': card_id})
+
 def get_user_cards(user_id):
     """Get all cards for a specific user"""
     try:
-        result = user_cards_table.query(
+        result = client.query(
+            TableName=user_cards_table.name,
             KeyConditionExpression='user_id = :uid',
-            ExpressionAttributeValues={':uid': user_id}
+            ExpressionAttributeValues={':uid': {'S': user_id}}
         )
 
-        user_cards = result.get('Items', [])
+        user_cards = [deserialize_for_response(item) for item in result.get('Items', [])]
+
+        # Rows carry denormalized card details; only legacy rows written before
+        # that still need their card fetched from the cards table
+        legacy_ids = [user_card['card_id'] for user_card in user_cards
+                      if 'cashback_categories' not in user_card]
+        cards = batch_get_cards(legacy_ids) if legacy_ids else {}
 
-        # Get full card details for each user card
         detailed_cards = []
         for user_card in user_cards:
-            card_id = user_card['card_id']
-            card_result = cards_table.get_item(Key={'card_id': card_id})
-
-            if 'Item' in card_result:
-                # Merge user card info with full card details
-                detailed_card = {
-                    **card_result['Item'],
-                    'added_date': user_card.get('added_date'),
-                    'card_status': user_card.get('card_status'),
-                    'user_notes': user_card.get('notes', '')
-                }
-                detailed_cards.append(detailed_card)
+            if 'cashback_categories' in user_card:
+                card = user_card
+            elif user_card['card_id'] in cards:
+                card = cards[user_card['card_id']]
+            else:
+                continue
+
+            # Same shape for both paths: card_id + wallet attributes + user fields
+            detailed_card = {'card_id': user_card['card_id']}
+            detailed_card.update((attr, card[attr]) for attr in WALLET_ATTRIBUTES if attr in card)
+            detailed_card.update(
+                added_date=user_card.get('added_date'),
+                card_status=user_card.get('card_status'),
+                user_notes=user_card.get('notes', '')
+            )
+            detailed_cards.append(detailed_card)
 
         return response(200, detailed_cards)
 
@@ -222,34 +396,35 @@ def add_card_to_user(user_id, data):
     try:
         # Validate
         if 'card_id' not in data:
-            return response(400, {'error': 'Missing card_id'})
+            return response(400, STATIC_BODIES['missing_card_id'])
 
         card_id = data['card_id']
 
         # Check if card exists
-        card_result = cards_table.get_item(Key={'card_id': card_id})
-        if 'Item' not in card_result:
-            return response(404, {'error': 'Card not found'})
-
-        # Check if user already has this card
-        existing = user_cards_table.get_item(
-            Key={'user_id': user_id, 'card_id': card_id}
-        )
-        if 'Item' in existing:
-            return response(400, {'error': 'User already has this card'})
+        card = load_card_summary(card_id)
+        if not card:
+            return response(404, STATIC_BODIES['card_not_found'])
 
-        # Add to user's wallet
+        # Add to user's wallet with the card details denormalized into the row
         user_card_item = {
             'user_id': user_id,
             'card_id': card_id,
-            'card_name': card_result['Item']['card_name'],
-            'bank': card_result['Item']['bank'],
-            'added_date': datetime.now().isoformat(),
+            'added_date': now_millis(),
             'card_status': 'active',
             'notes': data.get('notes', '')
         }
-
-        user_cards_table.put_item(Item=user_card_item)
+        user_card_item.update((attr, card[attr]) for attr in WALLET_ATTRIBUTES if attr in card)
+
+        # Conditional put fails if the user already has this card
+        try:
+            user_cards_table.put_item(
+                Item=user_card_item,
+                ConditionExpression=Attr('user_id').not_exists()
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return response(400, STATIC_BODIES['user_card_exists'])
+            raise
 
         return response(201, {
             'message': 'Card added to wallet successfully',
@@ -267,24 +442,181 @@ def remove_card_from_user(user_id, card_id):
             Key={'user_id': user_id, 'card_id': card_id}
         )
         if 'Item' not in result:
-            return response(404, {'error': 'Card not found in user wallet'})
+            return response(404, STATIC_BODIES['user_card_not_found'])
 
         # Remove from wallet
         user_cards_table.delete_item(
             Key={'user_id': user_id, 'card_id': card_id}
         )
 
-        return response(200, {'message': 'Card removed from wallet successfully'})
+        return response(200, STATIC_BODIES['user_card_removed'])
 
     except Exception as e:
         return response(500, {'error': f'Failed to remove card from user: {str(e)}'})
 
+# ============ Routing ============
+
+def parse_body(body):
+    """Parse a JSON request body, treating an empty body as {}"""
+    return json.loads(body) if body else {}
+
+# Segments at these positions are path parameters in every route
+PARAM_POSITIONS = (2, 4)
+
+# Path shape (None marks a parameter) -> {method: handler(params, body)}
+ROUTES = {
+    ('api', 'cards'): {
+        'GET': lambda params, body: get_all_cards(),
+        'POST': lambda params, body: create_card(parse_body(body))
+    },
+    # /api/cards/{card_id}
+    ('api', 'cards', None): {
+        'GET': lambda params, body: get_card(*params),
+        'DELETE': lambda params, body: delete_card(*params)
+    },
+    # /api/users/{user_id}/cards
+    ('api', 'users', None, 'cards'): {
+        'GET': lambda params, body: get_user_cards(*params),
+        'POST': lambda params, body: add_card_to_user(*params, parse_body(body))
+    },
+    # /api/users/{user_id}/cards/{card_id}
+    ('api', 'users', None, 'cards', None): {
+        'DELETE': lambda params, body: remove_card_from_user(*params)
+    }
+}
+
+def parse_path(path):
+    """Split a path into its route shape and the values of its parameters"""
+    parts = path.strip('/').split('/')
+    shape = tuple(None if i in PARAM_POSITIONS else part for i, part in enumerate(parts))
+    params = tuple(parts[i] for i in PARAM_POSITIONS if i < len(parts))
+    return shape, params
+
 # ============ Helper Functions ============
 
+def get_cached_card(card_id):
+    """Return a card from the TTL cache, or None if missing or expired"""
+    entry = card_cache.get(card_id)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+def cache_card(card):
+    """Store a card in the TTL cache, evicting the oldest entry when full"""
+    card_cache.pop(card['card_id'], None)
+    if len(card_cache) >= CARD_CACHE_SIZE:
+        card_cache.pop(next(iter(card_cache)))
+    card_cache[card['card_id']] = (time.monotonic() + CARD_CACHE_TTL, card)
+
+def fetch_card(card_id):
+    """Read a card straight from DynamoDB, returning None if it does not exist"""
+    result = client.get_item(
+        TableName=cards_table.name,
+        Key={'card_id': {'S': card_id}}
+    )
+    return deserialize_for_response(result['Item']) if 'Item' in result else None
+
+def load_card(card_id):
+    """Get a card through the TTL cache, falling back to DynamoDB on a miss"""
+    card = get_cached_card(card_id)
+    if card is None:
+        card = fetch_card(card_id)
+        if card:
+            cache_card(card)
+    return card
+
+def load_card_summary(card_id):
+    """Get a card's wallet attributes (with Decimal numbers, ready to be written)"""
+    # Bypasses the float-valued cache because the result is stored in user-cards
+    result = client.get_item(
+        TableName=cards_table.name,
+        Key={'card_id': {'S': card_id}},
+        ProjectionExpression=WALLET_PROJECTION
+    )
+    return deserialize_item(result['Item']) if 'Item' in result else None
+
+def batch_get_cards(card_ids):
+    """Fetch cards by ID (cache first, then BatchGetItem chunks), returning {card_id: card}"""
+    cards = {}
+    keys = []
+    for card_id in dict.fromkeys(card_ids):
+        card = get_cached_card(card_id)
+        if card is None:
+            keys.append({'card_id': {'S': card_id}})
+        else:
+            cards[card_id] = card
+
+    for start in range(0, len(keys), BATCH_GET_LIMIT):
+        request_items = {cards_table.name: {'Keys': keys[start:start + BATCH_GET_LIMIT]}}
+        attempt = 0
+
+        while request_items:
+            result = client.batch_get_item(RequestItems=request_items)
+            for item in result.get('Responses', {}).get(cards_table.name, []):
+                card = deserialize_for_response(item)
+                cards[card['card_id']] = card
+                cache_card(card)
+
+            # Retry unprocessed keys with exponential backoff, giving up after
+            # BATCH_RETRY_MAX_ATTEMPTS so sustained throttling surfaces as an error
+            request_items = result.get('UnprocessedKeys')
+            if request_items:
+                if attempt >= BATCH_RETRY_MAX_ATTEMPTS:
+                    raise RuntimeError(
+                        f'BatchGetItem still had unprocessed keys after {attempt} retries'
+                    )
+                time.sleep(min(BATCH_RETRY_BASE_DELAY * (2 ** attempt), BATCH_RETRY_MAX_DELAY))
+                attempt += 1
+
+    return cards
+
+def to_decimal(value):
+    """Convert a float or numeric string to Decimal, leaving other values as-is"""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, str) and NUMERIC_STRING.fullmatch(value):
+        return Decimal(value)
+    return value
+
+def convert_to_decimal(obj):
+    """Convert floats and numeric strings to Decimal, mutating containers in place"""
+    if not isinstance(obj, (dict, list)):
+        return to_decimal(obj)
+
+    # Walk nested dicts/lists with an explicit stack instead of recursion
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        keys = node.keys() if isinstance(node, dict) else range(len(node))
+        for key in keys:
+            value = node[key]
+            if isinstance(value, (dict, list)):
+                stack.append(value)
+            else:
+                node[key] = to_decimal(value)
+
+    return obj
+
+def now_millis():
+    """Current time as epoch milliseconds (a sortable DynamoDB Number)"""
+    return Decimal(int(time.time() * 1000))
+
+def serialize_item(item):
+    """Convert plain Python values into a low-level client item"""
+    return {key: serializer.serialize(value) for key, value in item.items()}
+
+def deserialize_item(item):
+    """Convert a low-level client item into plain Python values"""
+    return {key: deserializer.deserialize(value) for key, value in item.items()}
+
+def deserialize_for_response(item):
+    """Convert a low-level client item into plain Python values with float numbers"""
+    return {key: response_deserializer.deserialize(value) for key, value in item.items()}
+
 def response(status_code, body):
-    """Create HTTP response with CORS headers"""
+    """Create HTTP response with CORS headers (str bodies are sent pre-serialized)"""
     return {
         'statusCode': status_code,
         'headers': CORS_HEADERS,
-        'body': json.dumps(body, cls=DecimalEncoder)
+        'body': body if isinstance(body, str) else dumps(body)
     }